@@ -2,72 +2,138 @@
 """
 Stop Hook: Check for print() statements in modified Python files.
 
-This hook runs after each response and checks if any modified
-Python files contain print() statements that might be debug code.
-It provides warnings to help developers remember to remove
-debug statements before committing.
+This hook runs after each response and checks if the uncommitted
+changes to any Python files add print() statements that might be
+debug code. It provides warnings to help developers remember to
+remove debug statements before committing.
 
 Replaces check-console-log.js for Python projects.
 """
 
+import re
+import shutil
 import subprocess
 import sys
-from pathlib import Path
+from typing import Iterable
 
 
-def main():
-    # Read stdin (hook data)
-    data = sys.stdin.read()
+# print( at the start of a line, optionally indented. This skips
+# commented-out calls and "print(" appearing inside strings.
+PRINT_RE = re.compile(rb"^[ \t]*print\(")
+
+# The same pattern in git's POSIX ERE syntax, for `git diff -G`
+GIT_PRINT_PATTERN = r"^[[:blank:]]*print\("
+
+# New-file start line of a unified diff hunk header
+HUNK_RE = re.compile(rb"^@@ -\d+(?:,\d+)? \+(\d+)(?:,\d+)? @@")
+
+# Backslash escapes git uses inside C-quoted ("...") path names
+C_ESCAPE_RE = re.compile(rb'\\([0-7]{3}|.)')
+C_ESCAPES = {
+    b"a": b"\a", b"b": b"\b", b"f": b"\f", b"n": b"\n",
+    b"r": b"\r", b"t": b"\t", b"v": b"\v", b'"': b'"', b"\\": b"\\",
+}
+
+
+def unescape_c_char(match: re.Match) -> bytes:
+    """Decode one backslash escape (octal byte or named char) from git."""
+    escape = match.group(1)
+    if escape.isdigit():
+        return bytes([int(escape, 8)])
+    return C_ESCAPES.get(escape, escape)
+
+
+def parse_diff_path(raw: bytes) -> str:
+    """
+    Get the file name from the rest of a `+++ ` diff header line.
     
-    try:
-        # Check if we're in a git repository
-        result = subprocess.run(
-            ["git", "rev-parse", "--git-dir"],
-            capture_output=True,
-            text=True
-        )
-        if result.returncode != 0:
-            # Not in a git repo, just pass through the data
-            print(data)
-            return
-        
-        # Get list of modified files
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD"],
-            capture_output=True,
-            text=True
-        )
-        
-        files = [
-            f for f in result.stdout.strip().split("\n")
-            if f.endswith(".py") and Path(f).exists()
-        ]
-        
-        has_print = False
-        
-        # Check each file for print() statements
-        for file in files:
-            content = Path(file).read_text(encoding="utf-8")
-            # Simple check - look for print( that's not in a comment or string
-            # This is a basic heuristic
-            lines = content.split("\n")
-            for line_num, line in enumerate(lines, 1):
-                stripped = line.lstrip()
-                if stripped.startswith("#"):
-                    continue
-                if "print(" in line and not '"""' in line and not "'''" in line:
-                    print(f"[Hook] WARNING: print() found in {file}:{line_num}", file=sys.stderr)
-                    has_print = True
+    git appends a TAB to names containing a space, and wraps names with
+    unusual characters in double quotes with C-style escapes.
+    """
+    name = raw.rstrip(b"\t\r\n")
+    if len(name) >= 2 and name.startswith(b'"') and name.endswith(b'"'):
+        name = C_ESCAPE_RE.sub(unescape_c_char, name[1:-1])
+    return name.decode("utf-8", "replace")
+
+
+def find_added_prints(diff_lines: Iterable[bytes]) -> list[tuple[str, int]]:
+    """
+    Find added print() lines in a zero-context (-U0) diff.
+    
+    diff_lines can be any iterable of lines, such as a pipe from git,
+    so the diff never has to be held in memory all at once.
+    
+    Returns a list of (file, line_number) tuples, where line_number
+    refers to the file as it is in the working tree.
+    """
+    found = []
+    file = None
+    line_num = 0
+    in_header = False
+    
+    for line in diff_lines:
+        if line.startswith(b"diff --git "):
+            in_header = True
+        elif in_header:
+            if line.startswith(b"+++ "):
+                file = parse_diff_path(line[4:])
+            elif line.startswith(b"@@"):
+                in_header = False
+        if in_header:
+            continue
         
-        if has_print:
-            print("[Hook] Consider removing print() statements or using logger before committing", file=sys.stderr)
+        if line.startswith(b"@@"):
+            match = HUNK_RE.match(line)
+            line_num = int(match.group(1)) if match else 0
+        elif line.startswith(b"+"):
+            if file and PRINT_RE.match(line[1:]):
+                found.append((file, line_num))
+            line_num += 1
     
+    return found
+
+
+def warn_about_prints():
+    """Print a warning for each print() added by the uncommitted changes."""
+    # Let git do the searching: -G limits the diff to .py files
+    # whose changes touch a print( line, and -U0 keeps only the
+    # changed lines, so no working-tree files need to be read.
+    # The output is parsed line by line as git produces it. A
+    # non-zero exit code means we're not in a git repo (or there
+    # is no HEAD yet).
+    with subprocess.Popen(
+        [
+            "git", "-c", "core.quotePath=false",
+            "diff", "--no-color", "--no-ext-diff", "--no-prefix",
+            "-U0", "-G", GIT_PRINT_PATTERN, "HEAD", "--", "*.py",
+        ],
+        # stdin is the hook data we pass through afterwards, so git (and
+        # anything it spawns, such as a textconv driver) must not read it
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    ) as proc:
+        found = find_added_prints(proc.stdout)
+    if proc.returncode != 0 or not found:
+        # Not a repo, or no print() added - nothing to report
+        return
+    
+    for file, line_num in found:
+        print(f"[Hook] WARNING: print() found in {file}:{line_num}", file=sys.stderr)
+    
+    print("[Hook] Consider removing print() statements or using logger before committing", file=sys.stderr)
+
+
+def main():
+    try:
+        warn_about_prints()
     except Exception:
         # Silently ignore errors (git might not be available, etc.)
         pass
     
-    # Always output the original data
-    print(data)
+    # Always output the original hook data. It's only passed through,
+    # so stream it in chunks rather than reading it all into memory.
+    shutil.copyfileobj(sys.stdin.buffer, sys.stdout.buffer, 64 * 1024)
 
 
 if __name__ == "__main__":
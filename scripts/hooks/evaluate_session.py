@@ -54,8 +54,11 @@ def main():
     # Count existing learned skills
     learned_count = len(list(learned_dir.glob("*.md")))
     
-    print(f"[EvaluateSession] Session evaluated - {learned_count} learned skills in library", file=sys.stderr)
-    print("[EvaluateSession] Use /learn command to manually extract patterns", file=sys.stderr)
+    # Emit both messages in a single write
+    sys.stderr.write(
+        f"[EvaluateSession] Session evaluated - {learned_count} learned skills in library\n"
+        "[EvaluateSession] Use /learn command to manually extract patterns\n"
+    )
 
 
 if __name__ == "__main__":
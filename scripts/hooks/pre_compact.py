@@ -8,6 +8,7 @@ Runs before Claude compacts context, giving you a chance to
 preserve important state that might get lost in summarization.
 """
 
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -23,6 +24,34 @@ def get_sessions_dir() -> Path:
     return get_claude_dir() / "sessions"
 
 
+def append_lines(file_path: Path, parts: list[bytes]) -> None:
+    """Append byte chunks to a file in a single write (writev on POSIX)."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, parts)
+        else:
+            os.write(fd, b"".join(parts))
+    finally:
+        os.close(fd)
+
+
+def find_latest_session(sessions_dir: Path) -> Path | None:
+    """Return the most recently modified session file, if any."""
+    latest = None
+    latest_mtime = 0.0
+    
+    # One pass over the directory; each entry is stat'd once
+    with os.scandir(sessions_dir) as it:
+        for entry in it:
+            if entry.name.endswith("-session.tmp") and entry.is_file():
+                mtime = entry.stat().st_mtime
+                if latest is None or mtime > latest_mtime:
+                    latest, latest_mtime = entry.path, mtime
+    
+    return Path(latest) if latest else None
+
+
 def main():
     sessions_dir = get_sessions_dir()
     compaction_log = sessions_dir / "compaction-log.txt"
@@ -30,22 +59,20 @@ def main():
     sessions_dir.mkdir(parents=True, exist_ok=True)
     
     # Log compaction event with timestamp
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(compaction_log, "a", encoding="utf-8") as f:
-        f.write(f"[{timestamp}] Context compaction triggered\n")
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+    append_lines(compaction_log, [b"[", timestamp.encode(), b"] Context compaction triggered\n"])
     
     # If there's an active session file, note the compaction
-    sessions = sorted(
-        sessions_dir.glob("*-session.tmp"),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True
-    )
+    active_session = find_latest_session(sessions_dir)
     
-    if sessions:
-        active_session = sessions[0]
-        time_str = datetime.now().strftime("%H:%M")
-        with open(active_session, "a", encoding="utf-8") as f:
-            f.write(f"\n---\n**[Compaction occurred at {time_str}]** - Context was summarized\n")
+    if active_session:
+        time_str = now.strftime("%H:%M")
+        append_lines(active_session, [
+            b"\n---\n**[Compaction occurred at ",
+            time_str.encode(),
+            b"]** - Context was summarized\n",
+        ])
     
     print("[PreCompact] State saved before compaction", file=sys.stderr)
 
@@ -14,6 +14,12 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
 
 def get_claude_dir() -> Path:
     """Get the Claude config directory."""
@@ -33,30 +39,66 @@ def get_session_id_short() -> str:
     return "default"
 
 
+def append_lines(file_path: Path, parts: list[bytes], create: bool = True) -> None:
+    """
+    Append byte chunks to a file in a single write (writev on POSIX).
+    
+    With create=False, raises FileNotFoundError if the file is missing.
+    """
+    flags = os.O_WRONLY | os.O_APPEND
+    if create:
+        flags |= os.O_CREAT
+    fd = os.open(file_path, flags, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, parts)
+        else:
+            os.write(fd, b"".join(parts))
+    finally:
+        os.close(fd)
+
+
+def dump_json(obj: dict) -> bytes:
+    """Serialize obj as indented, UTF-8 encoded JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # orjson rejects lone surrogates, e.g. a cwd with non-UTF-8
+            # bytes decoded via surrogateescape; the stdlib escapes them
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def main():
     sessions_dir = get_sessions_dir()
     sessions_dir.mkdir(parents=True, exist_ok=True)
     
     session_id = get_session_id_short()
-    date_str = datetime.now().strftime("%Y-%m-%d")
+    now = datetime.now()
+    date_str = now.strftime("%Y-%m-%d")
     
-    # Create session end marker
     session_file = sessions_dir / f"{date_str}-{session_id}-session.tmp"
-    
-    if session_file.exists():
-        # Append end marker
-        with open(session_file, "a", encoding="utf-8") as f:
-            f.write(f"\n---\n**[Session ended at {datetime.now().strftime('%H:%M')}]**\n")
-    
-    # Save session metadata
     metadata_file = sessions_dir / f"{date_str}-{session_id}-metadata.json"
+    
+    # Prepare both payloads up front so the writes go out back-to-back
+    marker = f"\n---\n**[Session ended at {now:%H:%M}]**\n".encode()
     metadata = {
         "session_id": session_id,
-        "ended_at": datetime.now().isoformat(),
+        "ended_at": now.isoformat(),
         "cwd": str(Path.cwd()),
     }
+    metadata_json = dump_json(metadata)
     
-    metadata_file.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+    # Append end marker, if this session has a session file. Opening
+    # without O_CREAT doubles as the existence check.
+    try:
+        append_lines(session_file, [marker], create=False)
+    except FileNotFoundError:
+        pass
+    
+    # Save session metadata
+    metadata_file.write_bytes(metadata_json)
     
     print(f"[SessionEnd] Session state saved to {sessions_dir}", file=sys.stderr)
 
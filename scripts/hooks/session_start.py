@@ -8,8 +8,10 @@ Runs when a new Claude session starts. Checks for recent session
 files and notifies Claude of available context to load.
 """
 
+import os
 import sys
-from datetime import datetime, timedelta
+import time
+from fnmatch import fnmatch
 from pathlib import Path
 
 
@@ -33,14 +35,20 @@ def find_recent_files(directory: Path, pattern: str, max_age_days: int = 7) -> l
     if not directory.exists():
         return []
     
-    cutoff = datetime.now().timestamp() - (max_age_days * 24 * 60 * 60)
+    cutoff = time.time() - (max_age_days * 24 * 60 * 60)
     files = []
     
-    for f in directory.glob(pattern):
-        if f.is_file() and f.stat().st_mtime >= cutoff:
-            files.append(f)
+    # scandir gives us the file type from the directory entry, and the
+    # stat result is cached on the entry so each file is only stat'd once
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and fnmatch(entry.name, pattern):
+                mtime = entry.stat().st_mtime
+                if mtime >= cutoff:
+                    files.append((mtime, Path(entry.path)))
     
-    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+    files.sort(key=lambda item: item[0], reverse=True)
+    return [path for _, path in files]
 
 
 def is_poetry_project(project_dir: Path = None) -> bool:
@@ -52,6 +60,7 @@ def is_poetry_project(project_dir: Path = None) -> bool:
 def main():
     sessions_dir = get_sessions_dir()
     learned_dir = get_learned_skills_dir()
+    messages = []
     
     # Ensure directories exist
     sessions_dir.mkdir(parents=True, exist_ok=True)
@@ -62,23 +71,27 @@ def main():
     
     if recent_sessions:
         latest = recent_sessions[0]
-        print(f"[SessionStart] Found {len(recent_sessions)} recent session(s)", file=sys.stderr)
-        print(f"[SessionStart] Latest: {latest}", file=sys.stderr)
+        messages.append(f"[SessionStart] Found {len(recent_sessions)} recent session(s)")
+        messages.append(f"[SessionStart] Latest: {latest}")
     
     # Check for learned skills
     learned_skills = list(learned_dir.glob("*.md"))
     
     if learned_skills:
-        print(f"[SessionStart] {len(learned_skills)} learned skill(s) available in {learned_dir}", file=sys.stderr)
+        messages.append(f"[SessionStart] {len(learned_skills)} learned skill(s) available in {learned_dir}")
     
     # Detect project type
     cwd = Path.cwd()
     if is_poetry_project(cwd):
-        print("[SessionStart] Poetry project detected", file=sys.stderr)
+        messages.append("[SessionStart] Poetry project detected")
         if (cwd / "poetry.lock").exists():
-            print("[SessionStart] poetry.lock found - dependencies are locked", file=sys.stderr)
+            messages.append("[SessionStart] poetry.lock found - dependencies are locked")
     elif (cwd / "requirements.txt").exists():
-        print("[SessionStart] requirements.txt found - pip project detected", file=sys.stderr)
+        messages.append("[SessionStart] requirements.txt found - pip project detected")
+    
+    # Emit everything in a single write rather than one per message
+    if messages:
+        sys.stderr.write("\n".join(messages) + "\n")
 
 
 if __name__ == "__main__":
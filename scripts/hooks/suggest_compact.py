@@ -19,23 +19,54 @@ import tempfile
 from pathlib import Path
 
 
+# Upper bound on the counter file size (one byte per tool call)
+MAX_COUNT = 10_000
+
+
+def read_legacy_count(fd: int) -> int:
+    """
+    Read a counter file written by older versions as ASCII digits.
+    
+    Returns the stored count plus any calls appended since. Unreadable
+    content counts as zero.
+    """
+    os.lseek(fd, 0, os.SEEK_SET)
+    content = os.read(fd, os.fstat(fd).st_size)
+    digits = content.rstrip(b".")
+    calls = len(content) - len(digits)
+    try:
+        return int(digits) + calls
+    except ValueError:
+        return calls
+
+
 def main():
     # Track tool call count (increment in a temp file)
     session_id = os.environ.get("CLAUDE_SESSION_ID") or os.environ.get("PPID") or "default"
     counter_file = Path(tempfile.gettempdir()) / f"claude-tool-count-{session_id}"
     threshold = int(os.environ.get("COMPACT_THRESHOLD", "50"))
     
-    count = 1
-    
-    # Read existing count or start at 1
-    if counter_file.exists():
-        try:
-            count = int(counter_file.read_text().strip()) + 1
-        except (ValueError, OSError):
-            count = 1
-    
-    # Save updated count
-    counter_file.write_text(str(count))
+    # Each tool call appends one byte, so the file size is the count.
+    # This avoids reading, parsing and rewriting the counter every time.
+    fd = os.open(counter_file, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, b".")
+        count = os.fstat(fd).st_size
+        
+        # A file from an older version holds the count as digits;
+        # convert it to the one-byte-per-call format, keeping its count
+        os.lseek(fd, 0, os.SEEK_SET)
+        if os.read(fd, 1) != b".":
+            count = min(read_legacy_count(fd), MAX_COUNT)
+            os.ftruncate(fd, 0)
+            os.write(fd, b"." * count)
+        
+        # Keep the file bounded: wrap back to the threshold so the
+        # periodic reminders carry on
+        if count >= MAX_COUNT:
+            os.ftruncate(fd, min(threshold, MAX_COUNT // 2))
+    finally:
+        os.close(fd)
     
     # Suggest compact after threshold tool calls
     if count == threshold:
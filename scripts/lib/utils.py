@@ -10,7 +10,10 @@ import os
 import re
 import sys
 import subprocess
+import tempfile
+import time
 from datetime import datetime
+from fnmatch import fnmatchcase
 from pathlib import Path
 
 
@@ -19,6 +22,12 @@ IS_WINDOWS = sys.platform == "win32"
 IS_MACOS = sys.platform == "darwin"
 IS_LINUX = sys.platform.startswith("linux")
 
+# Allowed command names for command_exists()
+_CMD_RE = re.compile(r"^[a-zA-Z0-9_.-]+$")
+
+# Directories already created by ensure_dir() in this process
+_ENSURED_DIRS: set[str] = set()
+
 
 def get_home_dir() -> Path:
     """Get the user's home directory (cross-platform)."""
@@ -42,30 +51,42 @@ def get_learned_skills_dir() -> Path:
 
 def get_temp_dir() -> Path:
     """Get the temp directory (cross-platform)."""
-    import tempfile
     return Path(tempfile.gettempdir())
 
 
 def ensure_dir(dir_path: Path | str) -> Path:
-    """Ensure a directory exists (create if not)."""
+    """
+    Ensure a directory exists (create if not).
+    
+    Each directory is only created once per process; later calls for
+    the same path return without touching the filesystem.
+    """
     path = Path(dir_path)
-    path.mkdir(parents=True, exist_ok=True)
+    key = str(path)
+    if key not in _ENSURED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
     return path
 
 
-def get_date_string() -> str:
-    """Get current date in YYYY-MM-DD format."""
-    return datetime.now().strftime("%Y-%m-%d")
+def _now(now: datetime | None = None) -> datetime:
+    """Return the given datetime, or the current local time if None."""
+    return now if now is not None else datetime.now()
+
 
+def get_date_string(now: datetime | None = None) -> str:
+    """Get current (or given) date in YYYY-MM-DD format."""
+    return _now(now).strftime("%Y-%m-%d")
 
-def get_time_string() -> str:
-    """Get current time in HH:MM format."""
-    return datetime.now().strftime("%H:%M")
 
+def get_time_string(now: datetime | None = None) -> str:
+    """Get current (or given) time in HH:MM format."""
+    return _now(now).strftime("%H:%M")
 
-def get_datetime_string() -> str:
-    """Get current datetime in YYYY-MM-DD HH:MM:SS format."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def get_datetime_string(now: datetime | None = None) -> str:
+    """Get current (or given) datetime in YYYY-MM-DD HH:MM:SS format."""
+    return _now(now).strftime("%Y-%m-%d %H:%M:%S")
 
 
 def get_session_id_short(fallback: str = "default") -> str:
@@ -101,28 +122,27 @@ def find_files(
     if not directory.exists():
         return []
     
-    # Convert glob pattern to regex
-    regex_pattern = pattern.replace(".", r"\.").replace("*", ".*").replace("?", ".")
-    regex = re.compile(f"^{regex_pattern}$")
+    cutoff = None
+    if max_age_days is not None:
+        cutoff = time.time() - (max_age_days * 60 * 60 * 24)
     
     results = []
     
-    def search_dir(current_dir: Path):
+    def search_dir(current_dir: str):
         try:
-            for entry in current_dir.iterdir():
-                if entry.is_file() and regex.match(entry.name):
-                    stat = entry.stat()
-                    if max_age_days is not None:
-                        age_days = (datetime.now().timestamp() - stat.st_mtime) / (60 * 60 * 24)
-                        if age_days > max_age_days:
+            with os.scandir(current_dir) as it:
+                for entry in it:
+                    if entry.is_file() and fnmatchcase(entry.name, pattern):
+                        stat = entry.stat()
+                        if cutoff is not None and stat.st_mtime < cutoff:
                             continue
-                    results.append({"path": str(entry), "mtime": stat.st_mtime})
-                elif entry.is_dir() and recursive:
-                    search_dir(entry)
+                        results.append({"path": entry.path, "mtime": stat.st_mtime})
+                    elif entry.is_dir() and recursive:
+                        search_dir(entry.path)
         except PermissionError:
             pass
     
-    search_dir(directory)
+    search_dir(str(directory))
     results.sort(key=lambda x: x["mtime"], reverse=True)
     return results
 
@@ -168,16 +188,33 @@ def write_file(file_path: Path | str, content: str) -> None:
 
 def append_file(file_path: Path | str, content: str) -> None:
     """Append to a text file."""
+    append_lines(file_path, [content.encode("utf-8")])
+
+
+def append_lines(file_path: Path | str, parts: list[bytes]) -> None:
+    """
+    Append byte chunks to a file in a single write.
+    
+    Uses os.writev on POSIX so the parts go to the kernel as one iovec
+    without being joined first. Windows has no writev, so the parts are
+    joined and written with os.write instead.
+    """
     path = Path(file_path)
     ensure_dir(path.parent)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(content)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        if hasattr(os, "writev"):
+            os.writev(fd, parts)
+        else:
+            os.write(fd, b"".join(parts))
+    finally:
+        os.close(fd)
 
 
 def command_exists(cmd: str) -> bool:
     """Check if a command exists in PATH."""
     # Validate command name - only allow alphanumeric, dash, underscore, dot
-    if not re.match(r"^[a-zA-Z0-9_.-]+$", cmd):
+    if not _CMD_RE.match(cmd):
         return False
     
     try:
@@ -198,20 +235,19 @@ def command_exists(cmd: str) -> bool:
         return False
 
 
-def run_command(cmd: str, cwd: str | None = None) -> dict:
+def run_command(argv: list[str], cwd: str | None = None) -> dict:
     """
     Run a command and return output.
     
-    SECURITY NOTE: This function executes shell commands. Only use with
-    trusted, hardcoded commands. Never pass user-controlled input directly.
+    The command is given as an argument list and executed directly,
+    without a shell, so no quoting or shell syntax is interpreted.
     
     Returns:
         dict with 'success' (bool) and 'output' (str) keys
     """
     try:
         result = subprocess.run(
-            cmd,
-            shell=True,
+            argv,
             capture_output=True,
             text=True,
             cwd=cwd
@@ -226,25 +262,34 @@ def run_command(cmd: str, cwd: str | None = None) -> dict:
 
 def is_git_repo() -> bool:
     """Check if current directory is a git repository."""
-    return run_command("git rev-parse --git-dir")["success"]
+    # Only the exit code matters, so don't capture any output
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--git-dir"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return result.returncode == 0
+    except OSError:
+        return False
 
 
 def get_git_modified_files(patterns: list[str] | None = None) -> list[str]:
     """Get git modified files."""
-    if not is_git_repo():
-        return []
-    
-    result = run_command("git diff --name-only HEAD")
+    # git diff fails outside a repository, so there's no need for a
+    # separate is_git_repo() subprocess first
+    result = run_command(["git", "diff", "--name-only", "HEAD"])
     if not result["success"]:
         return []
     
     files = [f for f in result["output"].split("\n") if f]
     
     if patterns:
+        compiled = [re.compile(p) for p in patterns]
         filtered = []
         for file in files:
-            for pattern in patterns:
-                if re.search(pattern, file):
+            for regex in compiled:
+                if regex.search(file):
                     filtered.append(file)
                     break
         return filtered
@@ -275,14 +320,18 @@ def count_in_file(file_path: Path | str, pattern: str) -> int:
 
 def grep_file(file_path: Path | str, pattern: str) -> list[dict]:
     """Search for pattern in file and return matching lines with line numbers."""
-    content = read_file(file_path)
-    if content is None:
-        return []
-    
+    regex = re.compile(pattern)
     results = []
-    for idx, line in enumerate(content.split("\n"), 1):
-        if re.search(pattern, line):
-            results.append({"line_number": idx, "content": line})
+    
+    # Iterate over the file so only one line is held in memory at a time
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            for idx, line in enumerate(f, 1):
+                line = line.rstrip("\n")
+                if regex.search(line):
+                    results.append({"line_number": idx, "content": line})
+    except (OSError, IOError):
+        return []
     
     return results
 
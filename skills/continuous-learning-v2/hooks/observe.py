@@ -13,6 +13,27 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - it's several times faster, but the stdlib
+    # json module produces equivalent output
+    orjson = None
+
+
+# Directories already created by ensure_dir() in this process
+_ENSURED_DIRS: set[str] = set()
+
+
+def ensure_dir(dir_path: Path) -> Path:
+    """Ensure a directory exists, creating it at most once per process."""
+    key = str(dir_path)
+    if key not in _ENSURED_DIRS:
+        dir_path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+    return dir_path
 
 
 def get_config_dir() -> Path:
@@ -25,18 +46,20 @@ def get_observations_file() -> Path:
     return get_config_dir() / "observations.jsonl"
 
 
-def archive_if_needed(observations_file: Path, max_size_mb: int = 10):
-    """Archive observations file if it exceeds max size."""
-    if not observations_file.exists():
-        return
-    
+def archive_if_needed(
+    observations_file: Path,
+    size: int,
+    max_size_mb: int = 10,
+    now: Optional[datetime] = None
+):
+    """Archive observations file if its size (in bytes) exceeds max size."""
     try:
-        size_mb = observations_file.stat().st_size / (1024 * 1024)
+        size_mb = size / (1024 * 1024)
         if size_mb >= max_size_mb:
             archive_dir = get_config_dir() / "observations.archive"
-            archive_dir.mkdir(parents=True, exist_ok=True)
+            ensure_dir(archive_dir)
             
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            timestamp = (now or datetime.now()).strftime("%Y%m%d-%H%M%S")
             archive_path = archive_dir / f"observations-{timestamp}.jsonl"
             observations_file.rename(archive_path)
     except OSError:
@@ -81,12 +104,33 @@ def parse_hook_input(input_json: str) -> dict:
         return {"parsed": False, "error": str(e)}
 
 
-def write_observation(observation: dict, observations_file: Path):
-    """Write observation to file."""
-    observations_file.parent.mkdir(parents=True, exist_ok=True)
+def dump_json_line(obj: dict) -> bytes:
+    """Serialize obj as a UTF-8 encoded JSON line."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj) + b"\n"
+        except TypeError:
+            # orjson rejects lone surrogates (e.g. from a "\ud83d"
+            # escape in truncated tool output); the stdlib escapes them
+            pass
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+
+def write_observation(observation: dict, observations_file: Path) -> int:
+    """Write observation to file and return the file's new size in bytes."""
+    ensure_dir(observations_file.parent)
+    
+    # Encode before opening, so a failure can't leave an empty file behind
+    line = dump_json_line(observation)
     
-    with open(observations_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(observation) + "\n")
+    # Append the encoded line in a single write, then read the size
+    # from the open descriptor rather than stat'ing the path again
+    fd = os.open(observations_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
 
 
 def main():
@@ -94,7 +138,7 @@ def main():
     observations_file = get_observations_file()
     
     # Ensure directory exists
-    config_dir.mkdir(parents=True, exist_ok=True)
+    ensure_dir(config_dir)
     
     # Skip if disabled
     if (config_dir / "disabled").exists():
@@ -113,7 +157,8 @@ def main():
     parsed = parse_hook_input(input_json)
     
     # Get current timestamp
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    now = datetime.now(timezone.utc)
+    timestamp = now.strftime("%Y-%m-%dT%H:%M:%SZ")
     
     if not parsed.get("parsed"):
         # Log parse error for debugging
@@ -125,9 +170,6 @@ def main():
         write_observation(observation, observations_file)
         sys.exit(0)
     
-    # Archive if file too large
-    archive_if_needed(observations_file)
-    
     # Build observation
     observation = {
         "timestamp": timestamp,
@@ -142,7 +184,10 @@ def main():
         observation["output"] = parsed["output"]
     
     # Write observation
-    write_observation(observation, observations_file)
+    size = write_observation(observation, observations_file)
+    
+    # Archive if file too large
+    archive_if_needed(observations_file, size, now=now.astimezone())
 
 
 if __name__ == "__main__":
@@ -166,7 +166,10 @@ def cmd_status(args):
 
     # Observations stats
     if OBSERVATIONS_FILE.exists():
-        obs_count = sum(1 for _ in open(OBSERVATIONS_FILE))
+        # Count lines in binary mode - observations are UTF-8, which the
+        # locale's default encoding (e.g. cp1252, cp950) can't decode
+        with open(OBSERVATIONS_FILE, "rb") as f:
+            obs_count = sum(1 for _ in f)
         print(f"─────────────────────────────────────────────────────────")
         print(f"  Observations: {obs_count} events logged")
         print(f"  File: {OBSERVATIONS_FILE}")
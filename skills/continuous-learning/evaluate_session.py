@@ -44,10 +44,12 @@ def count_messages(transcript_path: Path) -> int:
         return 0
     
     try:
-        content = transcript_path.read_text(encoding="utf-8")
+        # Count on the raw bytes - the markers are ASCII, so there's
+        # no need to decode the whole transcript first
+        content = transcript_path.read_bytes()
         # Simple count of user message indicators
-        return content.count('"type":"user"') + content.count('"type": "user"')
-    except (OSError, UnicodeDecodeError):
+        return content.count(b'"type":"user"') + content.count(b'"type": "user"')
+    except OSError:
         return 0
 
 
@@ -87,13 +89,9 @@ def main():
         sys.exit(0)
     
     # Signal to Claude that session should be evaluated
-    print(
-        f"[ContinuousLearning] Session has {message_count} messages - evaluate for extractable patterns",
-        file=sys.stderr
-    )
-    print(
-        f"[ContinuousLearning] Save learned skills to: {learned_skills_path}",
-        file=sys.stderr
+    sys.stderr.write(
+        f"[ContinuousLearning] Session has {message_count} messages - evaluate for extractable patterns\n"
+        f"[ContinuousLearning] Save learned skills to: {learned_skills_path}\n"
     )
 
 